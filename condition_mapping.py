@@ -2,10 +2,17 @@
 import glob
 import json
 import os
+import re
 
 from IPython.display import clear_output, display, HTML
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional, and only speeds up saving / loading mapping files
+    orjson = None
+
 from snomed import Snomed
 
 class ConditionMapper():
@@ -36,9 +43,7 @@ class ConditionMapper():
 
     
     '''
-    unknown_strings: list[str]
     string_to_condition_cui: dict[str, int]
-    condition_cui_to_grouping_cui: dict[int, int]
     snomed: Snomed | None
     def __init__(self, input_file: str, file_number: int = 0, snomed: Snomed | None = None):
         '''Create a new ConditionMapper object
@@ -74,7 +79,7 @@ class ConditionMapper():
     
     def __str__(self):
         return f'''ConditionMapper for {self.input_file} with:
-        \t{len(self.unknown_strings)} unknown conditions,
+        \t{len(self._unknown_strings)} unknown conditions,
         \tand {len(self.string_to_condition_cui)} known conditions'''
 
     def mapping_file_path(self, n: int) -> str:
@@ -84,10 +89,11 @@ class ConditionMapper():
     @property
     def most_recent_mapping_file(self) -> int:
         '''Return the number of the most recent saved mapping file'''
-        existing_output_files = glob.glob(f'{self.output_location}_mapped_*.json')
-        if existing_output_files:
-            return max(int(f.split('_')[-1].replace('.json', '')) for f in existing_output_files)
-        return 0
+        output_directory, output_name = os.path.split(self.output_location)
+        mapping_file_regex = re.compile(re.escape(output_name) + r'_mapped_(\d+)\.json')
+        with os.scandir(output_directory or '.') as entries:
+            return max((int(m.group(1)) for entry in entries if (m := mapping_file_regex.fullmatch(entry.name))), 
+                       default=0)
     
     def save_mapping(self):
         '''Save the current mapping to a new file'''
@@ -95,19 +101,17 @@ class ConditionMapper():
         output_file = self.mapping_file_path(last_mapping_file_number + 1) 
 
         print(f'Saving mapping to {output_file}... ', end='')
-        with open(output_file, 'w', encoding='utf-8') as file:
-            data = {'unknown_strings': self.unknown_strings,
-                    'string_to_condition_cui': self.string_to_condition_cui,
-                    'condition_cui_to_grouping_cui': self.condition_cui_to_grouping_cui}
-            json.dump(data, file, indent=4)
+        data = {'unknown_strings': self.unknown_strings,
+                'string_to_condition_cui': self.string_to_condition_cui,
+                'condition_cui_to_grouping_cui': self.condition_cui_to_grouping_cui}
+        _save_json(output_file, data)
         print('Done')
 
     def load_from_mapping_file(self, n: int):
         '''Load a mapping from a specified saved file'''
         mapping_file = self.mapping_file_path(n)
         print(f'Loading mapping file {mapping_file}... ', end='')
-        with open(mapping_file, 'r', encoding='utf-8') as file:
-            mapping = json.load(file)
+        mapping = _load_json(mapping_file)
         print('Done')
         self.unknown_strings = mapping.get('unknown_strings', [])
         self.string_to_condition_cui = mapping.get('string_to_condition_cui', {})
@@ -115,7 +119,7 @@ class ConditionMapper():
         # As this is a dictionary, the keys are stored as strings:
         condition_to_grouping = mapping.get('condition_cui_to_grouping_cui', {})
         # Convert them back to integers:
-        self.condition_cui_to_grouping_cui = {int(k): v for k,v in condition_to_grouping.items()}
+        self.condition_cui_to_grouping_cui = dict(zip(map(int, condition_to_grouping), condition_to_grouping.values()))
     
     def load_from_most_recent_mapping_file(self):
         '''Load a mapping from the most recent saved file'''
@@ -144,24 +148,24 @@ class ConditionMapper():
         if not self.snomed:
             raise ValueError('No SNOMED object provided')
         
-        if len(self.unknown_strings) == 0:
+        if not self._unknown_strings:
             print('All conditions already mapped to SNOMED-CT')
             return
 
         print('Automatically mapping conditions to SNOMED-CT...')
-        for condition_name in self.unknown_strings:
-            cui = self.snomed.find_cui(condition_name)
-            if cui:
-                self.string_to_condition_cui[condition_name] = int(cui)
-                concept = self.snomed.get_primary_concept(cui)
-                print(f'\t{condition_name} mapped to {concept["name"]}')
-
-        self.unknown_strings = [condition for condition in self.unknown_strings 
-                                   if condition not in self.string_to_condition_cui]
-        if self.unknown_strings:
+        cuis = self.snomed.find_cuis(self._unknown_strings)
+        # Look names up by CUI, rather than relying on the rows lining up with the conditions
+        concepts = self.snomed.get_primary_concepts(set(cuis.values()))
+        concept_names = dict(zip(concepts['cui'], concepts['name']))
+        for condition_name, cui in cuis.items():
+            self.string_to_condition_cui[condition_name] = int(cui)
+            del self._unknown_strings[condition_name]
+            print(f'\t{condition_name} mapped to {concept_names[cui]}')
+
+        if self._unknown_strings:
             print(len(self.string_to_condition_cui), 'conditions mapped to SNOMED-CT.')
-            print(len(self.unknown_strings), 'conditions not mapped to SNOMED-CT:')
-            for condition in self.unknown_strings:
+            print(len(self._unknown_strings), 'conditions not mapped to SNOMED-CT:')
+            for condition in self._unknown_strings:
                 print(f'\t{condition}')
         else:
             print(f'All {len(self.string_to_condition_cui)} conditions mapped to SNOMED-CT')
@@ -190,7 +194,7 @@ class ConditionMapper():
         if not self.snomed:
             raise ValueError('No SNOMED object provided')
         
-        if len(self.unknown_strings) == 0:
+        if not self._unknown_strings:
             print('All conditions already mapped to SNOMED-CT')
             return
 
@@ -209,8 +213,8 @@ class ConditionMapper():
 
                 concept = self.snomed.get_primary_concept(cui)
                 print(f'\t{raw_name} mapped to {concept["name"]} ({cui})')
-                self.unknown_strings.remove(raw_name)
                 self.string_to_condition_cui[raw_name] = int(cui)
+                del self._unknown_strings[raw_name]
 
         print(f'{len([v for v in cuis.values() if not v])} conditions skipped:')
         for raw_name,manual_cui in cuis.items():
@@ -231,7 +235,7 @@ class ConditionMapper():
             raise ValueError('ConditionMapper must be initialized with a Snomed object to group conditions.')
 
         # 1. If the condition itself is already a known grouping, use that.
-        if cui in self.known_grouping_cuis:
+        if cui in self._grouping_cuis:
             return cui
         
         # Get condition and ancestors
@@ -242,7 +246,7 @@ class ConditionMapper():
         # We don't just assume that an ancestor is a grouping because it is a known grouping. 
         # For example, 'Lower Respiratory Tract Infection' is an ancestor of 'Bronchiolitis', but the 
         # user may wish to group 'Bronchiolitis' on its own.
-        known_ancestors = ancestors[ancestors['cui'].isin(self.known_grouping_cuis)].reset_index(drop=True)
+        known_ancestors = ancestors[ancestors['cui'].isin(self._grouping_cuis)].reset_index(drop=True)
         if len(known_ancestors)>0:
             clear_output()
             print(f'Select grouping for {condition["name"]}. Ancestors already used as groupings:')
@@ -287,7 +291,7 @@ class ConditionMapper():
     def group_conditions(self):
         '''Groups conditions not yet grouped into existing or new groupings.'''
         n_new_grouping_mappings = 0
-        n_groupings_start = len(self.known_grouping_cuis)
+        n_groupings_start = len(self._grouping_cuis)
         for condition_cui in set(self.known_condition_cuis):
             if condition_cui in self.condition_cui_to_grouping_cui:
                 continue
@@ -295,6 +299,7 @@ class ConditionMapper():
             grouping_cui = self.interactive_condition_group_selection(condition_cui)
             if grouping_cui:
                 self.condition_cui_to_grouping_cui[condition_cui] = grouping_cui
+                self._grouping_cuis.add(grouping_cui)
                 n_new_grouping_mappings += 1
             else:
                 abort = input('Abort Grouping? (y/N)')
@@ -302,12 +307,22 @@ class ConditionMapper():
                     break
 
         clear_output()
-        n_groupings_end = len(self.known_grouping_cuis)
+        n_groupings_end = len(self._grouping_cuis)
         print(f'{n_groupings_end - n_groupings_start} new groupings created.')
         print(f'{n_new_grouping_mappings} new condition -> grouping mappings created.')
 
 # ---------------------- Properties - manipuation of data structures ----------------------
 
+    @property
+    def unknown_strings(self) -> list[str]:
+        '''Returns a list of all strings not yet mapped to a condition, in their original order'''
+        return list(self._unknown_strings)
+
+    @unknown_strings.setter
+    def unknown_strings(self, strings: list[str]):
+        # Stored as an insertion-ordered dict (i.e. an ordered set), so mapped strings can be removed in O(1)
+        self._unknown_strings = dict.fromkeys(strings)
+
     @property
     def known_condition_cuis(self) -> list[int]:
         '''Returns a list of all CUIs for all known conditions'''
@@ -318,23 +333,31 @@ class ConditionMapper():
         '''Returns a DataFrame of all known conditions'''
         if not self.snomed:
             raise ValueError('No SNOMED object provided')
-        df = pd.DataFrame([self.snomed.get_primary_concept(cui) for cui in self.known_condition_cuis])
-        return df.reset_index(drop=True)
+        return self.snomed.get_primary_concepts(self.known_condition_cuis)
+
+    @property
+    def condition_cui_to_grouping_cui(self) -> dict[int, int]:
+        '''Returns the dictionary mapping condition CUIs to grouping CUIs'''
+        return self._condition_cui_to_grouping_cui
+
+    @condition_cui_to_grouping_cui.setter
+    def condition_cui_to_grouping_cui(self, mapping: dict[int, int]):
+        # Keep a live set of grouping CUIs, so membership checks while grouping are O(1). 
+        # Mutating the dictionary in place bypasses this, so new groupings must also be added to the set.
+        self._condition_cui_to_grouping_cui = mapping
+        self._grouping_cuis = set(mapping.values())
 
     @property
     def known_grouping_cuis(self) -> list[int]:
         '''Returns a list of all CUIs for all known groupings'''
-        return list(set(self.condition_cui_to_grouping_cui.values()))
+        return list(self._grouping_cuis)
     
     @property
     def known_groupings(self) -> pd.DataFrame:
         '''Returns a DataFrame of all conditions that have been grouped'''
         if not self.snomed:
             raise ValueError('No SNOMED object provided')
-        df = pd.DataFrame([self.snomed.get_primary_concept(cui) for cui in self.known_grouping_cuis])
-        if len(df) == 0:
-            return pd.DataFrame(columns=['cui', 'name', 'name_status', 'release', 'description_type_ids'])
-        return df.reset_index(drop=True)
+        return self.snomed.get_primary_concepts(self.known_grouping_cuis)
     
     @property 
     def condition_cui_to_strings(self) -> dict[int, list[str]]:
@@ -356,18 +379,17 @@ class ConditionMapper():
     def grouping_cui_to_strings(self) -> dict[int, list[str]]:
         '''Returns a dictionary mapping groupings to lists of condition strings'''
         grouping_to_strings = {}
-        for grouping, cuis in self.grouping_cui_to_condition_cuis.items():
-            for cui in cuis:
-                grouping_to_strings.setdefault(grouping, []).extend(self.condition_cui_to_strings[cui])
+        for condition, cui in self.string_to_condition_cui.items():
+            grouping = self.condition_cui_to_grouping_cui.get(cui)
+            if grouping is not None:
+                grouping_to_strings.setdefault(grouping, []).append(condition)
         return grouping_to_strings
     
     @property
     def string_to_grouping_cui(self) -> dict[str, int]:
         '''Returns a dictionary mapping condition strings to groupings'''
-        string_to_grouping = {}
-        for condition, cui in self.string_to_condition_cui.items():
-            string_to_grouping[condition] = self.condition_cui_to_grouping_cui.get(cui, -1)
-        return string_to_grouping
+        return {condition: self.condition_cui_to_grouping_cui.get(cui, -1) 
+                for condition, cui in self.string_to_condition_cui.items()}
 
     @property
     def groupings_table(self):
@@ -386,41 +408,42 @@ class ConditionMapper():
         '''
 
 
-        # Initialise DataFrame with string -> condition mapping
-        df = pd.DataFrame({'string': self.string_to_condition_cui.keys(),
-                           'condition_cui': self.string_to_condition_cui.values()})
-        
-        # Add in unknown strings
-        df_unknown = pd.DataFrame({'string': self.unknown_strings, 'condition_cui': -1})
-        df = pd.concat([df, df_unknown], sort=False)
-
-        # Add in condition names
-        df_condition_names = (self.known_conditions
-                         .set_index('cui')[['name']]
-                         .rename(columns={'name': 'condition_name'})
-                        )
-        df = df.join(df_condition_names, on='condition_cui', how='left')
-        df = df.fillna('Unknown')
-
-        # Add in grouping CUIs
-        df_grouping_cuis = pd.DataFrame({'grouping_cui': self.condition_cui_to_grouping_cui.values()}, 
-                    index=list(self.condition_cui_to_grouping_cui.keys()))
-        df = df.join(df_grouping_cuis, on='condition_cui', how='left')
-        df = df.fillna(-1)
-        df['grouping_cui'] = df['grouping_cui'].astype(int)
-
-        # Add in grouping names
-        df_grouping_names = (self.known_groupings
-                        .set_index('cui')[['name']]
-                        .rename(columns={'name': 'grouping_name'})
-                        )
-        df = df.join(df_grouping_names, on='grouping_cui', how='left')
-        df = df.fillna('Unknown')
+        # Initialise DataFrame with string -> condition mapping, followed by unknown strings
+        unknown_strings = self.unknown_strings
+        df = pd.DataFrame({'string': list(self.string_to_condition_cui) + unknown_strings,
+                           'condition_cui': list(self.string_to_condition_cui.values()) + [-1] * len(unknown_strings)})
+
+        # Fill in names and groupings with dictionary lookups, rather than joining DataFrames
+        known_conditions = self.known_conditions
+        condition_names = dict(zip(known_conditions['cui'], known_conditions['name']))
+        df['condition_name'] = df['condition_cui'].map(condition_names).fillna('Unknown')
+
+        df['grouping_cui'] = df['condition_cui'].map(self.condition_cui_to_grouping_cui).fillna(-1).astype(int)
+
+        known_groupings = self.known_groupings
+        grouping_names = dict(zip(known_groupings['cui'], known_groupings['name']))
+        df['grouping_name'] = df['grouping_cui'].map(grouping_names).fillna('Unknown')
 
         return df.set_index('string')
 
 
 def _load_data(file_path: str):
-    with open(file_path, 'r', encoding='utf-8') as file:
-        data = file.read().splitlines()
+    # Decode the whole file at once; splitlines handles any line endings, so text-mode translation isn't needed
+    with open(file_path, 'rb') as file:
+        data = file.read().decode('utf-8').splitlines()
     return data
+
+def _save_json(file_path: str, data: dict):
+    if orjson:
+        with open(file_path, 'wb') as file:
+            file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(file_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=4)
+
+def _load_json(file_path: str) -> dict:
+    if orjson:
+        with open(file_path, 'rb') as file:
+            return orjson.loads(file.read())
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return json.load(file)
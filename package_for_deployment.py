@@ -7,15 +7,18 @@ import zipfile
 import git
 
 repo = git.Repo('.')
-all_files = repo.git.execute(['git', 'ls-files'])
-files_to_exclude = ['.gitignore', 'package_for_deployment.py', '.pylintrc', 'README.md', 'LICENSE', 'requirements.txt']
+# NUL-separated output is split without any quoting/escaping of unusual file names
+all_files = repo.git.ls_files('-z')
+files_to_exclude = frozenset(['.gitignore', 'package_for_deployment.py', '.pylintrc', 
+                              'README.md', 'LICENSE', 'requirements.txt'])
 
-files_to_package = [f for f in all_files.split('\n') if f not in files_to_exclude]
+files_to_package = [f for f in all_files.split('\0') if f and f not in files_to_exclude]
 
 # Use current git tag as zip file name
 tag = repo.tags[-1]
 output_filename = f'snomed_squasher_{tag.name.replace('.', '_')}.zip'
 
-with zipfile.ZipFile(output_filename, 'w') as z:
+# Compress the (text) files, rather than storing them uncompressed
+with zipfile.ZipFile(output_filename, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=6) as z:
     for f in files_to_package:
         z.write(f)
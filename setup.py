@@ -8,30 +8,32 @@ If you already have a SNOMED Definitions directory, you can simply set the
  SNOMED_DEFINITIONS environment variable to the path of the directory.
 """
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 import os
+import re
 import shutil
-import tempfile
+import threading
 import zipfile
 
 import dotenv
 
+# Only concept, description, and relationship files are needed for the finding/disease ontology
+_RELEVANT_FILE_TYPE_RE = re.compile(r'_(?:Concept|Description|Relationship)_')
+_RELEVANT_RELEASE_TYPE = 'Snapshot'
 
-def get_relevant_files(directory: str) -> list[str]:
-    """Search a directory for files relevant to finding/disease ontology.
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+def get_relevant_members(archive: zipfile.ZipFile) -> list[str]:
+    """Lists the members of a SNOMED zip file relevant to finding/disease ontology.
     Only concept, description, and relationship files are relevant; 
      furthermore we only need snapshots, as full releases cover the entire history of SNOMED CT.    
     """
+    return [name for name in archive.namelist() if _is_relevant_file(os.path.basename(name))]
 
-    relevant_file_types = ['_Concept_', '_Description_', '_Relationship_']
-    relevant_release_type = 'Snapshot'
-
-    relevant_files = []
-    for root, _, files in os.walk(directory):
-        for file in files:
-            for file_type in relevant_file_types:
-                if file_type in file and relevant_release_type in file:
-                    relevant_files.append(os.path.join(root, file))
-    return relevant_files
+def _is_relevant_file(file: str) -> bool:
+    """Checks whether a file name is a Snapshot concept, description, or relationship file."""
+    # The plain substring check is cheaper than the regex, and rules out most files first
+    return _RELEVANT_RELEASE_TYPE in file and _RELEVANT_FILE_TYPE_RE.search(file) is not None
 
 def extract_and_copy_relevant_files(source: str, destination: str | None = None) -> list[str]:
     """Extracts a SNOMED zip file, keeping only files relevant to finding/disease ontology.
@@ -46,23 +48,75 @@ def extract_and_copy_relevant_files(source: str, destination: str | None = None)
      If no directory is specified, the files are not copied, but the paths are still returned.
     """
     with zipfile.ZipFile(source, 'r') as archive:
-        with tempfile.TemporaryDirectory() as temp_dir:
-            archive.extractall(temp_dir)
-            files_to_keep = get_relevant_files(temp_dir)
-            for root, dirs, files in os.walk(temp_dir, topdown=False):
-                for file in files:
-                    fullfile = os.path.join(root, file)
-                    if fullfile not in files_to_keep:
-                        os.remove(fullfile)
-                for d in dirs:
-                    full_dir = os.path.join(root, d)
-                    if not os.listdir(full_dir):
-                        os.rmdir(full_dir)
-
-            if destination:
-                shutil.copytree(temp_dir, destination)
-               
-            return [os.path.split(f)[1] for f in files_to_keep]
+        # Only decompress the members we need, rather than extracting everything and deleting the rest
+        members_to_keep = get_relevant_members(archive)
+        if destination:
+            _extract_members(source, members_to_keep, destination)
+
+        return [os.path.basename(m) for m in members_to_keep]
+
+def _extract_members(source: str, members: list[str], destination: str):
+    """Extracts archive members straight to their final location, rather than via a temporary directory.
+    
+    Every member is checked before any are extracted, so an unsafe archive leaves nothing behind.
+    """
+    _check_member_targets(destination, members)
+    _make_destination_directory(destination)
+
+    # ZipFile objects are not safe to share between threads, and opening one re-reads the whole central directory.
+    # So each worker opens the archive once, and reuses it for every member it extracts.
+    worker = threading.local()
+    archives = []
+    def open_archive():
+        worker.archive = zipfile.ZipFile(source, 'r')
+        archives.append(worker.archive)
+
+    try:
+        # zlib releases the GIL, so members can be decompressed and written in parallel threads
+        with ThreadPoolExecutor(max_workers=os.cpu_count(), initializer=open_archive) as executor:
+            list(executor.map(lambda member: _extract_member(worker.archive, member, destination), members))
+    finally:
+        for archive in archives:
+            archive.close()
+
+def _make_destination_directory(destination: str):
+    """Creates the destination directory. An existing directory is only reused if it is empty."""
+    try:
+        os.makedirs(destination)
+    except FileExistsError:
+        if not os.path.isdir(destination) or not _is_empty_directory(destination):
+            raise
+
+def _is_empty_directory(directory: str) -> bool:
+    """Checks whether a directory is empty, stopping at the first entry rather than listing them all."""
+    with os.scandir(directory) as entries:
+        return next(entries, None) is None
+
+def _extract_member(archive: zipfile.ZipFile, member: str, destination: str):
+    """Decompresses a single archive member to the same relative path within the destination directory.
+    
+    The archive must belong to the calling thread, as ZipFile objects are not safe to share between threads.
+    """
+    target = _member_target(destination, member)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with archive.open(member) as source_file, open(target, 'wb') as target_file:
+        shutil.copyfileobj(source_file, target_file, _COPY_BUFFER_SIZE)
+
+def _check_member_targets(destination: str, members: list[str]):
+    """Checks that every member extracts inside the destination, raising a ValueError otherwise."""
+    for member in members:
+        _member_target(destination, member)
+
+def _member_target(destination: str, member: str) -> str:
+    """Returns the path an archive member extracts to, refusing members that would escape the destination.
+    
+    Unlike extractall, writing members directly doesn't strip absolute paths or '..' components, so check them here.
+    """
+    root = os.path.realpath(destination)
+    target = os.path.realpath(os.path.join(destination, member))
+    if os.path.commonpath([root, target]) != root or target == root:
+        raise ValueError(f'Archive member {member!r} would be extracted outside of {destination}')
+    return target
 
 def extract_all_files(source: str, destination: str | None = None) -> list[str]:
     """Extracts all files from a SNOMED zip file.
@@ -77,12 +131,15 @@ def extract_all_files(source: str, destination: str | None = None) -> list[str]:
      If no directory is specified, the files are not copied, but the paths are still returned.
     """
     with zipfile.ZipFile(source, 'r') as archive:
-        with tempfile.TemporaryDirectory() as temp_dir:
-            archive.extractall(temp_dir)
-            if destination:
-                shutil.copytree(temp_dir, destination)
-            files = [file for _, _, files in os.walk(temp_dir) for file in files]
-            return files
+        members = [name for name in archive.namelist() if not name.endswith('/')]
+        if destination:
+            # Every member is needed, so a single extractall straight in to the destination is fastest:
+            # per-member threads only pay off when picking out a few large members.
+            _check_member_targets(destination, members)
+            _make_destination_directory(destination)
+            archive.extractall(destination)
+
+        return [os.path.basename(m) for m in members]
 
 def main():
     """Main setup script"""
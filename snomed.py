@@ -1,24 +1,78 @@
 """Module to parse SNOMED definitions."""
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Callable, Iterable
+import functools
 import glob
+import hashlib
 import os
+import re
 
 import dotenv
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+except ImportError:
+    # pyarrow is optional, and only speeds up loading the SNOMED definitions
+    pa = pc = pa_csv = None
+
 dotenv.load_dotenv()
 
-def parse_file(file_path: str, drop_inactive=True) -> pd.DataFrame:
-    """Reads in a SNOMED file and returns a DataFrame."""
+_NO_ROWS = np.array([], dtype=np.intp)
+_CSV_CHUNK_SIZE = 500_000
+_ARROW_BLOCK_SIZE = 8 * 1024 * 1024
 
-    # Explicitly tell pandas to read the 'term' column as a string. 
-    # This prevents a bug where the string 'None' or 'N/A' is read as NaN
-    converters = {'term': str} 
+# Description types are in parentheses at the end of primary names, such as (finding) or (organism)
+_DESCRIPTION_TYPE_RE = re.compile(r"\((\w+\s?.?\s?\w+.?\w+.?\w+.?)\)$")
+_CACHE_DIR = '.cache'
+# Part of the cache key. Bump this whenever the columns or dtypes of the parsed definitions change,
+# so caches written by older code are rebuilt rather than silently reused.
+_CACHE_VERSION = 1
 
-    df = pd.read_csv(file_path, sep='\t', converters=converters)
+def parse_file(file_path: str, drop_inactive=True, columns: list[str] | None = None, 
+               where: dict[str, int] | None = None) -> pd.DataFrame:
+    """Reads in a SNOMED file and returns a DataFrame.
+
+    Parameters:
+        file_path (str): Path to the SNOMED file
+        drop_inactive (bool): If True, only active rows are kept, and the active column is dropped
+        columns (list[str], optional): The columns to keep. If not provided, all columns are kept.
+        where (dict[str, int], optional): Only keep rows where each of these columns equals the given value
+    
+    Rows are filtered as the file is read, so dropped rows are never built in to a DataFrame.
+    Uses pyarrow's multithreaded CSV reader if pyarrow is installed, otherwise the pandas C parser (in chunks).
+    """
+    where = dict(where or {})
     if drop_inactive:
-        df = df[df.active == 1]
-        df.drop(columns=['active'], inplace=True)
+        where['active'] = 1
+    read_columns = None if columns is None else columns + [c for c in where if c not in columns]
+
+    # Explicitly read the 'term' column as a string, and don't treat any values as missing. 
+    # This prevents a bug where the string 'None' or 'N/A' is read as NaN
+    if pa_csv:
+        convert_options = pa_csv.ConvertOptions(column_types={'term': pa.string()}, include_columns=read_columns,
+                                                null_values=[], strings_can_be_null=False)
+        # Larger blocks than the 1 MiB default mean fewer, bigger chunks to parse in parallel and then combine
+        table = pa_csv.read_csv(file_path, read_options=pa_csv.ReadOptions(block_size=_ARROW_BLOCK_SIZE),
+                                parse_options=pa_csv.ParseOptions(delimiter='\t'), convert_options=convert_options)
+        if where:
+            # Combine the conditions in to a single mask, so the table is only filtered (copied) once
+            conditions = [pc.equal(table[column], value) for column, value in where.items()]
+            table = table.filter(functools.reduce(pc.and_, conditions))
+        df = table.to_pandas()
+    else:
+        chunks = pd.read_csv(file_path, sep='\t', dtype={'term': str}, keep_default_na=False, 
+                             usecols=read_columns, chunksize=_CSV_CHUNK_SIZE)
+        df = pd.concat([_filter_rows(chunk, where) for chunk in chunks], ignore_index=True)
+
+    if columns is not None:
+        return df[columns]
+    if drop_inactive:
+        return df.drop(columns=['active'])
     return df
 
 class Snomed():
@@ -27,6 +81,8 @@ class Snomed():
     Parameters:
         path (str, optional): Path to the SNOMED definitions. 
                                 If not provided, will check for an environment variable called SNOMED_DEFINITIONS.
+        use_cache (bool): If True (and pyarrow is installed), the parsed definitions are cached as Parquet files
+                                in a .cache directory within the definitions, and reused until the source files change.
     
     Attributes:
         definitions_path (str): Path to the SNOMED Definitions (full extracted version, or CDR only).
@@ -37,6 +93,8 @@ class Snomed():
     Methods:
         find_cui(name: str) -> int | None: 
             Finds a concept by name, returning the CUI if found, otherwise None.
+        find_cuis(names: Iterable[str]) -> dict[str, int]: 
+            Finds CUIs for many names at once, omitting names without a single match.
         find_concepts(name: str) -> pd.DataFrame: 
             Finds a concept by name. Returns ideally one perfect match, 
                 otherwise multiple partial matches, or an empty DataFrame.
@@ -44,6 +102,8 @@ class Snomed():
             Returns all concepts with the specified CUI.
         get_primary_concept(cui: int) -> pd.Series: 
             Returns the primary concept with the specified CUI.
+        get_primary_concepts(cuis: Iterable[int]) -> pd.DataFrame: 
+            Returns the primary concepts with the specified CUIs.
         get_parents(cui: int, primary_only: bool = True) -> pd.DataFrame: 
             Returns the parent concept(s) of the specified CUI.
         get_parents_by_name(name: str, primary_only: bool = True) -> pd.DataFrame: 
@@ -57,12 +117,108 @@ class Snomed():
         
     
     """
-    def __init__(self, definitions_path: str | None = None):
+    def __init__(self, definitions_path: str | None = None, use_cache: bool = True):
         self.definitions_path = _get_snomed_definitions_path(definitions_path)
 
         self.releases = self._list_available_releases()
-        self.concepts = self._load_all_concept_definitions()
-        self.relationships = self._load_all_hierarchy_definitions()
+        # Concepts, relationships, and their indexes are loaded on first use (see the cached properties below)
+        self._use_cache = use_cache and pa is not None
+
+        # The same names and CUIs are looked up repeatedly while mapping conditions. 
+        # The definitions don't change once loaded, so these lookups can be cached.
+        self._cached_find_cui = functools.lru_cache(maxsize=None)(self._find_cui)
+        self._cached_primary_concept = functools.lru_cache(maxsize=None)(self._find_primary_concept)
+
+        # Ancestor trees overlap heavily in SNOMED, and are often requested repeatedly when grouping conditions
+        self._cached_ancestors = functools.lru_cache(maxsize=4096)(self._find_ancestors)
+        # The traversals themselves are small tuples, so all of them can be kept, even once their DataFrames are evicted
+        self._cached_ancestor_levels = functools.lru_cache(maxsize=None)(self._find_ancestor_levels)
+
+    # ---- Lazily loaded definitions ----
+
+    @functools.cached_property
+    def concepts(self) -> pd.DataFrame:
+        """All concepts in the Definitions. Loaded on first access."""
+        return self._load_definitions('concepts', self._load_all_concept_definitions)
+
+    @functools.cached_property
+    def relationships(self) -> pd.DataFrame:
+        """All `is_a` relationships in the Definitions. Loaded on first access, so name lookups never parse them."""
+        return self._load_definitions('relationships', self._load_all_hierarchy_definitions)
+
+    @functools.cached_property
+    def _lowercase_names(self) -> pd.Series:
+        """Lowercased concept names, normalised once rather than on every case-insensitive search."""
+        return self.concepts.name.str.lower()
+
+    @functools.cached_property
+    def _arrow_lowercase_names(self) -> 'pa.Array':
+        """Lowercased concept names as an Arrow array, for vectorised substring searches. Requires pyarrow."""
+        return pa.array(self._lowercase_names.to_numpy(), type=pa.string())
+
+    @functools.cached_property
+    def _factorized_names(self) -> tuple[np.ndarray, pd.Index]:
+        """An integer code for each row's (lowercased) name, and the distinct names those codes refer to."""
+        return pd.factorize(self._lowercase_names)
+
+    @functools.cached_property
+    def _name_codes(self) -> dict[str, int]:
+        """The code of each distinct (lowercased) concept name, so exact name matches don't need a full scan."""
+        _, names = self._factorized_names
+        return dict(zip(names, range(len(names))))
+
+    @functools.cached_property
+    def _name_order(self) -> np.ndarray:
+        """Row positions of the concepts, sorted by name code (and by position within each name)."""
+        codes, _ = self._factorized_names
+        return np.argsort(codes, kind='stable')
+
+    @functools.cached_property
+    def _sorted_name_codes(self) -> np.ndarray:
+        """The name code of each row in _name_order, so name lookups can binary search rather than scan."""
+        codes, _ = self._factorized_names
+        return codes[self._name_order]
+
+    @functools.cached_property
+    def _cui_order(self) -> np.ndarray:
+        """Row positions of the concepts, sorted by CUI (and by position within each CUI)."""
+        return np.argsort(self.concepts.cui.to_numpy(), kind='stable')
+
+    @functools.cached_property
+    def _sorted_cuis(self) -> np.ndarray:
+        """The CUI of each row in _cui_order, so CUI lookups can binary search rather than scan."""
+        return self.concepts.cui.to_numpy()[self._cui_order]
+
+    @functools.cached_property
+    def _is_primary(self) -> np.ndarray:
+        """Whether each concept row is a primary concept."""
+        return (self.concepts.name_status == 'P').to_numpy()
+
+    @functools.cached_property
+    def _primary_concepts(self) -> pd.DataFrame:
+        """Primary concepts indexed by CUI, for bulk lookups."""
+        return self.concepts[self.concepts.name_status == 'P'].set_index('cui')
+
+    @functools.cached_property
+    def _duplicated_primary_cuis(self) -> set[int]:
+        """CUIs with more than one primary concept (e.g. a primary name in more than one release)."""
+        index = self._primary_concepts.index
+        return set(index[index.duplicated()])
+
+    @functools.cached_property
+    def _edges(self) -> pd.DataFrame:
+        """Distinct (child, parent) pairs. The same `is_a` relationship is usually repeated in every release."""
+        return self.relationships[['sourceId', 'destinationId']].drop_duplicates()
+
+    @functools.cached_property
+    def _parents(self) -> dict[int, np.ndarray]:
+        """Parent CUIs of each concept, so hierarchy lookups don't need to scan the relationships."""
+        return _group_by_key(self._edges.sourceId, self._edges.destinationId)
+
+    @functools.cached_property
+    def _children(self) -> dict[int, np.ndarray]:
+        """Child CUIs of each concept, so hierarchy lookups don't need to scan the relationships."""
+        return _group_by_key(self._edges.destinationId, self._edges.sourceId)
 
     def find_cui(self, name: str) -> int | None:
         """Wrapper for find_cui, but returns a single concept, or None if not found / multiple found.
@@ -73,7 +229,11 @@ class Snomed():
         Returns the CUI of the concept if found, otherwise None.
         
         """
+        # Every search tier is case-insensitive, so differently-cased names can share a cache entry
+        return self._cached_find_cui(name.lower())
 
+    def _find_cui(self, name: str) -> int | None:
+        """Finds the CUI for a name. Results are cached per name in _cached_find_cui."""
         matches = self.find_concepts(name)
 
         if len(matches) == 1:
@@ -81,6 +241,28 @@ class Snomed():
 
         return None
         
+    def find_cuis(self, names: Iterable[str]) -> dict[str, int]:
+        """Finds the CUIs for many names at once.
+        
+        Equivalent to calling find_cui for each name, but exact matches are read straight from the name index.
+         Only names without any exact match fall back to find_cui.
+
+        Parameters:
+            names (Iterable[str]): The names to search for
+
+        Returns a dictionary mapping names to CUIs. Names without a single matching concept are omitted.
+        """
+        cuis = {}
+        for name in names:
+            positions = self._rows_for_name(name.lower())
+            if positions is None:
+                cui = self.find_cui(name)
+                if cui is not None:
+                    cuis[name] = cui
+            elif len(positions) == 1:
+                cuis[name] = self.concepts.cui.iat[positions[0]].item()
+        return cuis
+
     def find_concepts(self, name: str) -> pd.DataFrame:
         """Finds a concept by name.
         
@@ -88,7 +270,7 @@ class Snomed():
         
         If no matches, will try to find exact matches with a ' (disorder)' or ' (finding)' suffix.
 
-        If no matches, will try to find partial matches.
+        If no matches, will try to find partial (case-insensitive substring) matches.
 
         Parameters:
             name (str): The name to search for
@@ -98,18 +280,25 @@ class Snomed():
         """
 
         # Try full match first
-        match = self.concepts.loc[self.concepts.name.str.fullmatch(name, case=False)]
-
-        if match.empty:
-            # Get all full matches, optionally with ' (disorder)' or ' (finding)' suffix
-            regex = name +  r'(?: \(disorder\)| \(finding\))'
-            match = self.concepts.loc[self.concepts.name.str.fullmatch(regex, case=False)]
-        
-        if match.empty:
-            # Try partial match
-            match = self.concepts.loc[self.concepts.name.str.contains(name, case=False)]
-        
-        return match
+        lowercase_name = name.lower()
+        positions = self._rows_for_name(lowercase_name)
+
+        if positions is None:
+            # Get all full matches with ' (disorder)' or ' (finding)' suffix
+            suffixed_positions = [rows for suffix in (' (disorder)', ' (finding)')
+                                  if (rows := self._rows_for_name(lowercase_name + suffix)) is not None]
+            if suffixed_positions:
+                positions = np.sort(np.concatenate(suffixed_positions))
+
+        if positions is not None:
+            return self.concepts.iloc[positions]
+
+        # Try partial match. The name is a literal substring (not a regex), as condition names often contain brackets
+        if pc:
+            # pyarrow scans the names in a single vectorised kernel, rather than a Python call per name
+            matches = pc.match_substring(self._arrow_lowercase_names, lowercase_name)
+            return self.concepts.loc[matches.to_numpy(zero_copy_only=False)]
+        return self.concepts.loc[self._lowercase_names.str.contains(lowercase_name, regex=False)]
     
     def get_concepts(self, cui: int) -> pd.DataFrame:
         """Returns all concepts with the specified CUI.
@@ -119,7 +308,7 @@ class Snomed():
 
         Returns a DataFrame containing the matching concepts.
         """
-        return self.concepts[self.concepts.cui == cui]
+        return self.concepts.iloc[self._rows_for_cui(cui)]
     
     def get_primary_concept(self, cui: int) -> pd.Series:
         """Returns the primary concept with the specified CUI.
@@ -129,6 +318,11 @@ class Snomed():
 
         Returns a DataFrame containing the matching primary concept as a single row.
         """
+        # Return a copy, so callers can't modify the cached Series
+        return self._cached_primary_concept(cui).copy()
+
+    def _find_primary_concept(self, cui: int) -> pd.Series:
+        """Finds the primary concept for a CUI. Results are cached per CUI in _cached_primary_concept."""
         concepts = self.get_concepts(cui)
         primary_concept = concepts[concepts.name_status == 'P']
         if primary_concept.empty:
@@ -137,6 +331,24 @@ class Snomed():
             raise ValueError(f"Multiple primary concepts found for CUI {cui}")
         return primary_concept.iloc[0]
 
+    def get_primary_concepts(self, cuis: Iterable[int]) -> pd.DataFrame:
+        """Returns the primary concepts with the specified CUIs, using a single indexed lookup.
+        
+        Parameters:
+            cuis (Iterable[int]): The CUIs to search for
+
+        Returns a DataFrame containing one primary concept per CUI, in the order given.
+         Like get_primary_concept, raises a ValueError if any CUI has no primary concept, or more than one.
+        """
+        cuis = list(cuis)
+        missing = [cui for cui in cuis if cui not in self._primary_concepts.index]
+        if missing:
+            raise ValueError(f"No primary concept found for CUIs {missing}")
+        duplicated = [cui for cui in cuis if cui in self._duplicated_primary_cuis]
+        if duplicated:
+            raise ValueError(f"Multiple primary concepts found for CUIs {duplicated}")
+        return self._primary_concepts.loc[cuis].reset_index()
+
     def get_parents(self, cui: int, primary_only: bool = True) -> pd.DataFrame:
         """Returns the parent concept(s) [first-order ancestors] of the specified CUI.
         
@@ -146,11 +358,7 @@ class Snomed():
 
         Returns a DataFrame containing the parent concepts.
         """
-        parent_ids = self.relationships[self.relationships.sourceId == cui].destinationId
-        parents = self.concepts[self.concepts.cui.isin(parent_ids)]
-        if primary_only:
-            parents = parents[parents.name_status == 'P']
-        return parents
+        return self._get_concepts_with_cuis(self._parents.get(cui, ()), primary_only)
     
     def get_parents_by_name(self, name: str, primary_only: bool = True) -> pd.DataFrame:
         """Returns the parent concept(s) [first-order ancestors] of the specified name.
@@ -161,10 +369,7 @@ class Snomed():
 
         Returns a DataFrame containing the parent concepts.
         """
-        cui = self.find_cui(name)
-        if cui is None:
-            raise ValueError(f"No concept found with name {name}")
-        return self.get_parents(cui, primary_only)
+        return self.get_parents(self._resolve_cui(name), primary_only)
     
     def get_children(self, cui: int, primary_only: bool = True) -> pd.DataFrame:
         """Returns the child concept(s) [first-order descendants] of the specified CUI.
@@ -175,11 +380,7 @@ class Snomed():
 
         Returns a DataFrame containing the child concepts.
         """
-        child_ids = self.relationships[self.relationships.destinationId == cui].sourceId
-        children = self.concepts[self.concepts.cui.isin(child_ids)]
-        if primary_only:
-            children = children[children.name_status == 'P']
-        return children
+        return self._get_concepts_with_cuis(self._children.get(cui, ()), primary_only)
 
     def get_children_by_name(self, name: str, primary_only: bool = True) -> pd.DataFrame:
         """Returns the child concept(s) [first-order descendants] of the specified name.
@@ -190,10 +391,7 @@ class Snomed():
 
         Returns a DataFrame containing the child concepts.
         """
-        cui = self.find_cui(name)
-        if cui is None:
-            raise ValueError(f"No concept found with name {name}")
-        return self.get_children(cui, primary_only)
+        return self.get_children(self._resolve_cui(name), primary_only)
 
     def get_ancestors(self, cui: int) -> pd.DataFrame:
         """Returns all ancestor concepts of the specified CUI (primary only) [using breadth-first search].
@@ -204,21 +402,38 @@ class Snomed():
         Returns a DataFrame containing the ancestor concepts, along with the level -  
          the minimum number of steps required to reach the concept from the specified CUI.
         """
-        q = deque()
-        ancestors = []
-        levels = []
-        q.append([cui, 0])
-        while q:
-            c, level = q.popleft()
-            if c in ancestors:
-                continue
-            ancestors.append(c)
-            levels.append(level)
-            q.extend([[a, level+1] for a in self.get_parents(c)['cui']])
+        # Return a copy, so callers can't modify the cached DataFrame
+        return self._cached_ancestors(cui).copy()
+
+    def _find_ancestors(self, cui: int) -> pd.DataFrame:
+        """Finds all ancestor concepts of the specified CUI. Results are cached per CUI in _cached_ancestors."""
+        cuis, levels = self._cached_ancestor_levels(cui)
+        # Gather row positions as arrays and combine them once, rather than boxing each position in a Python list
+        rows = [self._rows_for_cui(c) for c in cuis]
+        positions = np.concatenate(rows)
+        row_levels = np.repeat(levels, [len(r) for r in rows])
+        is_primary = self._is_primary[positions]
+
+        df = self.concepts.iloc[positions[is_primary]].reset_index(drop=True)
+        df['level'] = row_levels[is_primary]
+        return df
+
+    def _find_ancestor_levels(self, cui: int) -> tuple[tuple[int, ...], tuple[int, ...]]:
+        """Finds the CUI and each of its ancestors, with their levels, in breadth-first order.
+         Results are cached per CUI in _cached_ancestor_levels.
         
-        df = self.concepts[(self.concepts.cui.isin(ancestors)) & (self.concepts.name_status == 'P')]
-        df_levels = pd.DataFrame({'cui': ancestors, 'level': levels})
-        return df.merge(df_levels, on='cui', how='left').sort_values('level').reset_index(drop=True)
+        SNOMED is a DAG rather than a tree, so ancestors are often reachable by several paths. 
+         BFS reaches each one first by its shortest path, so it is only ever expanded once, at its minimum level.
+        """
+        levels = {cui: 0}
+        q = deque([cui])
+        while q:
+            c = q.popleft()
+            for parent in self._parents.get(c, ()):
+                if parent not in levels:
+                    levels[parent] = levels[c] + 1
+                    q.append(parent)
+        return tuple(levels), tuple(levels.values())
     
     def get_ancestors_by_name(self, name: str) -> pd.DataFrame:
         """Returns all ancestor concepts of the specified name (primary only).
@@ -229,18 +444,118 @@ class Snomed():
         Returns a DataFrame containing the ancestor concepts, along with the level, 
          the minimum number of steps required to reach the concept from the specified CUI.  
         """
+        return self.get_ancestors(self._resolve_cui(name))
+
+    def _rows_for_name(self, lowercase_name: str) -> np.ndarray | None:
+        """Returns the row positions of the concepts with a (lowercased) name, in their original order.
+         Returns None if no concept has the name.
+        """
+        # Like _rows_for_cui, two sorted arrays take far less memory than a dict holding a small array per name
+        code = self._name_codes.get(lowercase_name)
+        if code is None:
+            return None
+        start = np.searchsorted(self._sorted_name_codes, code, side='left')
+        end = np.searchsorted(self._sorted_name_codes, code, side='right')
+        return self._name_order[start:end]
+
+    def _rows_for_cui(self, cui: int) -> np.ndarray:
+        """Returns the row positions of a CUI's concepts, in their original order."""
+        # Two sorted arrays take far less memory than a dict holding a small array per CUI
+        start = np.searchsorted(self._sorted_cuis, cui, side='left')
+        end = np.searchsorted(self._sorted_cuis, cui, side='right')
+        return self._cui_order[start:end]
+
+    def _resolve_cui(self, name: str) -> int:
+        """Finds the CUI for a name, for the *_by_name methods. Raises a ValueError if there isn't a single match."""
         cui = self.find_cui(name)
         if cui is None:
             raise ValueError(f"No concept found with name {name}")
-        return self.get_ancestors(cui)
+        return cui
+
+    def _get_concepts_with_cuis(self, cuis: Iterable[int], primary_only: bool) -> pd.DataFrame:
+        """Returns the concepts with any of the specified CUIs, in their original order."""
+        positions = [self._rows_for_cui(cui) for cui in cuis]
+        positions = np.unique(np.concatenate(positions)) if positions else _NO_ROWS
+        if primary_only:
+            positions = positions[self._is_primary[positions]]
+        return self.concepts.iloc[positions]
 
     def _list_available_releases(self) -> list[str]:
         """Lists the available releases in the Definitions."""
-        return [f for f in os.listdir(self.definitions_path) if os.path.isdir(os.path.join(self.definitions_path, f))]
+        # Hidden directories (e.g. the cache) are not releases. 
+        # scandir entries carry their file type, so each entry doesn't need a separate stat call.
+        with os.scandir(self.definitions_path) as entries:
+            return [entry.name for entry in entries if not entry.name.startswith('.') and entry.is_dir()]
     
+    @property
+    def _release_dtype(self) -> pd.CategoricalDtype:
+        """Categorical dtype for the release columns."""
+        return pd.CategoricalDtype(self.releases)
+
+    def _release_column(self, release: str, length: int) -> pd.Categorical:
+        """Builds a release column as a categorical directly, rather than repeating the release name on every row.
+         All releases share the same categories, so concatenating them keeps the categorical dtype.
+        """
+        codes = np.full(length, self.releases.index(release))
+        return pd.Categorical.from_codes(codes, dtype=self._release_dtype)
+
+    def _find_release_file(self, release: str, file_type: str) -> str:
+        """Finds the Snapshot file of the given type (Concept, Description, or Relationship) for a release."""
+        return glob.glob(os.path.join(self.definitions_path, release, 
+                                      'Snapshot', 'Terminology', f'*_{file_type}_*.txt'))[0]
+
+    # ---- Parquet cache ----
+
+    def _load_definitions(self, name: str, load: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """Loads a DataFrame of definitions from the Parquet cache, parsing and caching it if necessary.
+        
+        The cache is keyed on the paths, sizes, and modification times of the source files, 
+         so it is rebuilt whenever the definitions change. Failing to write the cache is not an error.
+        """
+        if not self._use_cache:
+            return load()
+
+        cache_dir = os.path.join(self.definitions_path, _CACHE_DIR)
+        cache_path = os.path.join(cache_dir, f'{self._source_files_key()}_{name}.parquet')
+        try:
+            return pd.read_parquet(cache_path)
+        except (OSError, pa.ArrowInvalid):
+            pass
+
+        df = load()
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            _write_parquet(df, cache_path)
+            _remove_stale_cache_files(cache_dir, name, keep=cache_path)
+        except OSError:
+            pass
+        return df
+
+    def _source_files_key(self) -> str:
+        """Hashes the cache version, and the path, size, and modification time of every source file 
+         the definitions are parsed from.
+        """
+        source_files = [self._find_release_file(release, file_type) for release in sorted(self.releases) 
+                        for file_type in ('Concept', 'Description', 'Relationship')]
+        digest = hashlib.sha1(f'version:{_CACHE_VERSION}|'.encode())
+        for path in source_files:
+            stat = os.stat(path)
+            digest.update(f'{os.path.relpath(path, self.definitions_path)}:{stat.st_size}:{stat.st_mtime_ns}|'.encode())
+        return digest.hexdigest()
+
+    # ---- Parsing ----
+    
+    def _load_releases(self, load: Callable[[str], pd.DataFrame]) -> list[pd.DataFrame]:
+        """Loads each release in parallel, returning the DataFrames in the same order as the releases.
+        
+        Threads are enough, as the CSV parsers release the GIL while reading.
+        """
+        with ThreadPoolExecutor(max_workers=min(len(self.releases), os.cpu_count() or 1) or 1) as executor:
+            return list(executor.map(load, self.releases))
+
     def _load_all_concept_definitions(self):
         """Loads all releases and concatenates in to a single DataFrame of concepts."""
-        concepts = pd.concat([self._load_concept_definition(r) for r in self.releases])
+        concepts = pd.concat(self._load_releases(self._load_concept_definition))
         concepts.reset_index(inplace=True)
         concepts = _extract_description_type(concepts)
         return concepts
@@ -251,19 +566,15 @@ class Snomed():
             raise ValueError(f"Release {release} not found in {self.definitions_path}")
         
         # Find the concept and description files
-        concept_file = glob.glob(os.path.join(self.definitions_path, release, 
-                                              'Snapshot', 'Terminology', '*_Concept_*.txt'))[0]
-        description_file = glob.glob(os.path.join(self.definitions_path, release, 'Snapshot', 
-                                                  'Terminology', '*_Description_*.txt'))[0]
+        concept_file = self._find_release_file(release, 'Concept')
+        description_file = self._find_release_file(release, 'Description')
 
         # Read in DataFrames, drop unnecessary columns, and merge
-        concepts = parse_file(concept_file)
-        concepts.drop(columns=['effectiveTime', 'moduleId', 'definitionStatusId'], inplace=True)
+        concepts = parse_file(concept_file, columns=['id'])
         concepts.set_index('id', drop=True, inplace=True)
 
-        descriptions = parse_file(description_file)
+        descriptions = parse_file(description_file, columns=['id', 'conceptId', 'typeId', 'term'])
         descriptions.set_index('conceptId', drop=True, inplace=True)
-        descriptions.drop(columns=['moduleId', 'languageCode', 'effectiveTime', 'caseSignificanceId'], inplace=True)
 
         df = pd.merge(concepts, descriptions, left_index=True, right_index=True, how='inner')
         df.drop(columns=['id'], inplace=True)
@@ -272,14 +583,14 @@ class Snomed():
 
         # Process and add columns
         df = _convert_type_id(df)
-        df['release'] = release
+        df['release'] = self._release_column(release, len(df))
 
         return df
     
     def _load_all_hierarchy_definitions(self) -> pd.DataFrame:
         """Loads all releases and concatenates in to a single DataFrame of hierarchy definitions."""
-        relationships = pd.concat([self._load_hierarchy_definition(r) for r in self.releases])
-        return relationships.reset_index(drop=True)
+        # Build the new index while concatenating, rather than copying the result again to reset it
+        return pd.concat(self._load_releases(self._load_hierarchy_definition), ignore_index=True)
 
     def _load_hierarchy_definition(self, release: str) -> pd.DataFrame:
         """Loads the hierarchy definition (`is_a` relationships) for a release."""
@@ -289,16 +600,38 @@ class Snomed():
             raise ValueError(f"Release {release} not found in {self.definitions_path}")
         
         # Find the relationship file
-        relationship_file = glob.glob(os.path.join(self.definitions_path, release, 
-                                                   'Snapshot', 'Terminology', '*_Relationship_*.txt'))[0]
-        # Read in DataFrame and drop unnecessary columns
-        df = parse_file(relationship_file)
-        df = df[df.typeId == isa_id]
-        df = df[['id', 'sourceId', 'destinationId']]
-        df['release'] = release
-        return df.reset_index(drop=True)
+        relationship_file = self._find_release_file(release, 'Relationship')
+        # Read in only the `is_a` relationships, and only the necessary columns
+        df = parse_file(relationship_file, columns=['id', 'sourceId', 'destinationId'], where={'typeId': isa_id})
+        df['release'] = self._release_column(release, len(df))
+        return df
 # ------------------------------ Utils ---------------------------------------
 
+def _write_parquet(df: pd.DataFrame, path: str):
+    """Writes a DataFrame to Parquet via a temporary file, so an interrupted write never leaves a partial cache."""
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        df.to_parquet(temp_path, engine='pyarrow', compression='zstd')
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def _remove_stale_cache_files(cache_dir: str, name: str, keep: str):
+    """Removes cached files for older versions of the definitions, so the cache doesn't grow with every release."""
+    with os.scandir(cache_dir) as entries:
+        stale = [entry.path for entry in entries 
+                 if entry.name.endswith(f'_{name}.parquet') and entry.path != keep]
+    for path in stale:
+        os.remove(path)
+
+def _filter_rows(df: pd.DataFrame, where: dict[str, int]) -> pd.DataFrame:
+    """Keeps only the rows where each column equals the given value."""
+    mask = np.ones(len(df), dtype=bool)
+    for column, value in where.items():
+        mask &= df[column].to_numpy() == value
+    return df[mask]
+
 def _get_snomed_definitions_path(definitions_path: str | None) -> str:
     """Returns the path to the SNOMED definitions."""
     if definitions_path:
@@ -308,6 +641,11 @@ def _get_snomed_definitions_path(definitions_path: str | None) -> str:
     
     raise ValueError('No SNOMED definitions path specified')
 
+def _group_by_key(keys: pd.Series, values: pd.Series) -> dict[int, np.ndarray]:
+    """Groups values by key, returning a dictionary of key -> array of values."""
+    values = values.to_numpy()
+    return {key: values[positions] for key, positions in keys.groupby(keys).indices.items()}
+
 # ----------------------- Concept Definition Processing -----------------------
 
 def _convert_type_id(df: pd.DataFrame) -> pd.DataFrame:
@@ -322,7 +660,11 @@ def _convert_type_id(df: pd.DataFrame) -> pd.DataFrame:
             900000000000013009: 'A'  # Alternative / Synonym
         }
 
-    df['name_status'] = df.typeId.apply(lambda x: name_statuses[x])
+    # Vectorised lookup, stored as a categorical (1 byte per row rather than a Python string)
+    name_status = df.typeId.map(name_statuses)
+    if name_status.isna().any():
+        raise ValueError(f"Unknown description type IDs: {df.typeId[name_status.isna()].unique().tolist()}")
+    df['name_status'] = name_status.astype(pd.CategoricalDtype(['P', 'A']))
     df.drop(columns=['typeId'], inplace=True)
     return df
 
@@ -337,10 +679,12 @@ def _extract_description_type(df: pd.DataFrame) -> pd.DataFrame:
 
     Alternative / synonym entries receive an empty string in the description_type_ids column.
     """
-    description_type_regex = r"\((\w+\s?.?\s?\w+.?\w+.?\w+.?)\)$"
-
-    primary_concept_descriptions=df[df['name_status']=='P']['name'].str.extract(description_type_regex)
-    primary_concept_descriptions.columns = ['description_type_ids']
-    df2 = df.join(primary_concept_descriptions, how='left')
-    df2.description_type_ids = df2.description_type_ids.fillna('')
-    return df2
+    # Only extract from the primary rows, and write the results back by position rather than joining
+    is_primary = (df['name_status'] == 'P').to_numpy()
+    description_type_ids = np.full(len(df), '', dtype=object)
+    description_type_ids[is_primary] = (df['name'][is_primary]
+                                        .str.extract(_DESCRIPTION_TYPE_RE, expand=False)
+                                        .fillna('')
+                                        .to_numpy())
+    df['description_type_ids'] = description_type_ids
+    return df